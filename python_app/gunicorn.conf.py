@@ -0,0 +1,17 @@
+"""
+Gunicorn settings for serving the BakuScan Flask app
+Run from this directory with: gunicorn main:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Scan history, analysis caches and background market jobs live in process memory,
+# so a single worker keeps them consistent; threads carry the I/O-bound concurrency
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+
+timeout = 60
+graceful_timeout = 30
@@ -1,19 +1,43 @@
 import os
+import io
 import json
+import math
+import re
 import base64
+import hashlib
 import uuid
 import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import orjson
 from flask import Flask, render_template, request, jsonify, session
+from flask.json.provider import JSONProvider
 from groq import Groq
 from dotenv import load_dotenv
+from PIL import Image, ImageOps
 
 load_dotenv()
 
-from scraper import get_market_data, scrape_ebay_prices, scrape_reference_images
+from scraper import (get_market_data, get_cached_market_data, market_cache_key, scrape_ebay_prices,
+                     scrape_reference_images)
+
+
+class OrjsonProvider(JSONProvider):
+    """Route request.json and jsonify through orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = os.environ.get('SESSION_SECRET', 'dev-secret-key')
+app.config['MAX_CONTENT_LENGTH'] = 8 * 1024 * 1024
 
 BAKUGAN_CATALOG = []
 base_dir = os.path.dirname(os.path.abspath(__file__)) if '__file__' in dir() else '/home/runner/workspace/python_app'
@@ -22,18 +46,14 @@ with open(catalog_path, 'r') as f:
     BAKUGAN_CATALOG = json.load(f)
 
 BAKUGAN_NAMES = [b['name'] for b in BAKUGAN_CATALOG]
+BAKUGAN_BY_NAME = {b['name'].casefold(): b for b in BAKUGAN_CATALOG}
+BAKUGAN_NAMES_CF = frozenset(BAKUGAN_BY_NAME)
+_NAMES_LIST = ', '.join(BAKUGAN_NAMES)
 
-SCANS_STORAGE = {}
-
-def analyze_bakugan(image_base64: str) -> dict:
-    client = Groq(api_key=os.environ.get('GROQ_API_KEY'))
-    
-    names_list = ', '.join(BAKUGAN_NAMES)
-    
-    prompt = f"""You are a Bakugan identification expert specializing in the original 2007-2012 toy line.
+ANALYSIS_PROMPT = f"""You are a Bakugan identification expert specializing in the original 2007-2012 toy line.
 
 CATALOG OF KNOWN BAKUGAN:
-{names_list}
+{_NAMES_LIST}
 
 Analyze this image and identify the Bakugan. Respond in JSON format only:
 {{
@@ -48,28 +68,275 @@ Analyze this image and identify the Bakugan. Respond in JSON format only:
 
 If not a Bakugan or unclear, set confidence below 0.3 and name to "Unknown"."""
 
+_GROQ_CLIENT = None
+_GROQ_CLIENT_LOCK = threading.Lock()
+
+
+def get_groq_client() -> Groq:
+    """Return the shared Groq client so its HTTP connection pool stays warm across requests"""
+    global _GROQ_CLIENT
+    if _GROQ_CLIENT is None:
+        with _GROQ_CLIENT_LOCK:
+            if _GROQ_CLIENT is None:
+                _GROQ_CLIENT = Groq(api_key=os.environ.get('GROQ_API_KEY'))
+    return _GROQ_CLIENT
+
+HISTORY_LIMIT = 50
+
+SCANS_STORAGE = defaultdict(lambda: deque(maxlen=HISTORY_LIMIT))
+
+MARKET_CONFIDENCE_THRESHOLD = 0.5
+MARKET_JOBS_LIMIT = 1024
+# Worst case is an HTTP timeout followed by the Selenium fallback for eBay, then Bing on the same tab
+MARKET_JOB_DEADLINE = 90
+# Jobs waiting for a worker beyond this are refused, so queued scans can't wait unboundedly
+MARKET_QUEUE_LIMIT = 16
+
+_MARKET_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='market')
+_MARKET_JOBS = OrderedDict()  # scan_id -> MarketJob
+_MARKET_INFLIGHT = {}  # market_cache_key -> MarketJob still running, shared by every scan of that Bakugan
+_MARKET_JOBS_LOCK = threading.Lock()
+
+
+class MarketJob:
+    """
+    One background get_market_data call
+    The deadline clock starts when a worker picks the job up, not while it sits in the executor queue
+    """
+    
+    def __init__(self, name: str, attribute, rarity):
+        self.started = None
+        self.future = _MARKET_EXECUTOR.submit(self._run, name, attribute, rarity)
+    
+    def _run(self, name, attribute, rarity):
+        self.started = time.monotonic()
+        return get_market_data(name, attribute, rarity)
+    
+    @property
+    def queued(self) -> bool:
+        return self.started is None
+    
+    def timed_out(self) -> bool:
+        return self.started is not None and time.monotonic() - self.started > MARKET_JOB_DEADLINE
+
+ANALYSIS_CACHE_SIZE = 512
+PHASH_MAX_DISTANCE = 5
+
+_EXACT_CACHE = OrderedDict()
+_PHASH_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+_BASE64_WHITESPACE = str.maketrans('', '', ' \t\r\n')
+
+UPLOAD_MAX_DIMENSION = 1024
+UPLOAD_JPEG_QUALITY = 80
+UPLOAD_PASSTHROUGH_BYTES = 512 * 1024
+# Well above any phone camera, far below what an 8MB body can decompress to
+UPLOAD_MAX_PIXELS = 50_000_000
+Image.MAX_IMAGE_PIXELS = UPLOAD_MAX_PIXELS
+
+
+class InvalidImageError(ValueError):
+    """The upload decoded from base64 but is not an image we can read"""
+
+_DCT_SIZE = 32
+_DCT_KEEP = 8
+_DCT_COS = [
+    [math.cos(math.pi * (2 * x + 1) * k / (2 * _DCT_SIZE)) for x in range(_DCT_SIZE)]
+    for k in range(_DCT_KEEP)
+]
+
+
+def compute_phash(img: Image.Image) -> int:
+    """64-bit perceptual hash: low-frequency 8x8 DCT block thresholded at its median"""
+    small = img.convert('L').resize((_DCT_SIZE, _DCT_SIZE), Image.LANCZOS)
+    pixels = list(small.getdata())
+
+    rows = [pixels[y * _DCT_SIZE:(y + 1) * _DCT_SIZE] for y in range(_DCT_SIZE)]
+    row_coeffs = [[sum(p * c for p, c in zip(row, cos_k)) for cos_k in _DCT_COS] for row in rows]
+    coeffs = [
+        sum(row_coeffs[y][u] * _DCT_COS[v][y] for y in range(_DCT_SIZE))
+        for v in range(_DCT_KEEP)
+        for u in range(_DCT_KEEP)
+    ]
+
+    median = sorted(coeffs)[len(coeffs) // 2]
+    fingerprint = 0
+    for value in coeffs:
+        fingerprint = (fingerprint << 1) | (value > median)
+    return fingerprint
+
+
+def prepare_upload_image(img: Image.Image, image_bytes: bytes) -> bytes:
+    """Downscale and re-encode as JPEG unless the upload is already a small JPEG"""
+    if (img.format == 'JPEG' and len(image_bytes) <= UPLOAD_PASSTHROUGH_BYTES
+            and max(img.size) <= UPLOAD_MAX_DIMENSION):
+        return image_bytes
+
+    # Re-encoding drops EXIF, so bake any orientation tag into the pixels first
+    resized = ImageOps.exif_transpose(img).convert('RGB')
+    resized.thumbnail((UPLOAD_MAX_DIMENSION, UPLOAD_MAX_DIMENSION), Image.LANCZOS)
+    buf = io.BytesIO()
+    resized.save(buf, format='JPEG', quality=UPLOAD_JPEG_QUALITY)
+    return buf.getvalue()
+
+
+def _exact_lookup(exact_key: bytes):
+    with _CACHE_LOCK:
+        if exact_key in _EXACT_CACHE:
+            _EXACT_CACHE.move_to_end(exact_key)
+            return dict(_EXACT_CACHE[exact_key])
+    return None
+
+
+def _phash_lookup(phash: int):
+    with _CACHE_LOCK:
+        for key, cached in _PHASH_CACHE.items():
+            if (key ^ phash).bit_count() <= PHASH_MAX_DISTANCE:
+                _PHASH_CACHE.move_to_end(key)
+                return dict(cached)
+    return None
+
+
+def is_confident_match(result: dict) -> bool:
+    """True when the model named a Bakugan with at least MARKET_CONFIDENCE_THRESHOLD confidence"""
+    try:
+        confidence = float(result.get('confidence') or 0)
+    except (TypeError, ValueError):
+        confidence = 0.0
+    
+    name = result.get('name')
+    return (confidence >= MARKET_CONFIDENCE_THRESHOLD and isinstance(name, str)
+            and bool(name) and name not in ('Unknown', 'Error'))
+
+
+def _cache_store(exact_key: bytes, phash: int, result: dict):
+    with _CACHE_LOCK:
+        _EXACT_CACHE[exact_key] = dict(result)
+        _EXACT_CACHE.move_to_end(exact_key)
+        if len(_EXACT_CACHE) > ANALYSIS_CACHE_SIZE:
+            _EXACT_CACHE.popitem(last=False)
+
+        _PHASH_CACHE[phash] = dict(result)
+        _PHASH_CACHE.move_to_end(phash)
+        if len(_PHASH_CACHE) > ANALYSIS_CACHE_SIZE:
+            _PHASH_CACHE.popitem(last=False)
+
+
+def normalize_to_catalog(result: dict) -> dict:
+    """Snap the model's name onto the catalog spelling and fill the series from the catalog entry"""
+    name = result.get('name')
+    if isinstance(name, str):
+        key = name.strip().casefold()
+        if key in BAKUGAN_NAMES_CF:
+            entry = BAKUGAN_BY_NAME[key]
+            result['name'] = entry['name']
+            if not result.get('series'):
+                result['series'] = entry.get('series')
+    return result
+
+
+def read_json_object(stream):
+    """Consume a completion stream until the first top-level JSON object closes"""
+    chunks = []
+    offset = 0
+    start = None
+    depth = 0
+    in_string = False
+    skip = -1
+    
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        text = chunk.choices[0].delta.content
+        if not text:
+            continue
+        chunks.append(text)
+        
+        for match in _JSON_TOKEN_RE.finditer(text):
+            pos = offset + match.start()
+            if pos == skip:
+                continue
+            ch = match.group()
+            
+            if in_string:
+                if ch == '\\':
+                    skip = pos + 1
+                elif ch == '"':
+                    in_string = False
+            elif depth == 0:
+                if ch == '{':
+                    start = pos
+                    depth = 1
+            elif ch == '"':
+                in_string = True
+            elif ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return ''.join(chunks)[start:pos + 1]
+        
+        offset += len(text)
+    
+    return None
+
+
+def analyze_bakugan(image_bytes: bytes) -> dict:
+    """Identify the Bakugan in an upload; raises InvalidImageError if the bytes aren't a readable image"""
+    exact_key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    cached = _exact_lookup(exact_key)
+    if cached is not None:
+        return cached
+
     try:
-        response = client.chat.completions.create(
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            if img.width * img.height > UPLOAD_MAX_PIXELS:
+                raise InvalidImageError(f"{img.width}x{img.height} exceeds {UPLOAD_MAX_PIXELS} pixels")
+            # JPEGs decode at a reduced scale; nothing downstream needs more than UPLOAD_MAX_DIMENSION
+            img.draft('RGB', (UPLOAD_MAX_DIMENSION, UPLOAD_MAX_DIMENSION))
+            phash = compute_phash(img)
+            cached = _phash_lookup(phash)
+            if cached is not None:
+                _cache_store(exact_key, phash, cached)
+                return cached
+            upload_bytes = prepare_upload_image(img, image_bytes)
+    except InvalidImageError:
+        raise
+    except Exception as e:
+        raise InvalidImageError(str(e)) from e
+
+    image_base64 = base64.b64encode(upload_bytes).decode('ascii')
+
+    try:
+        response = get_groq_client().chat.completions.create(
             model="meta-llama/llama-4-scout-17b-16e-instruct",
             messages=[
                 {
                     "role": "user",
                     "content": [
-                        {"type": "text", "text": prompt},
+                        {"type": "text", "text": ANALYSIS_PROMPT},
                         {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}}
                     ]
                 }
             ],
-            max_tokens=1024,
-            temperature=0.3
+            max_tokens=256,
+            temperature=0.3,
+            stream=True
         )
         
-        result_text = response.choices[0].message.content or ""
+        try:
+            json_text = read_json_object(response)
+        finally:
+            response.close()
         
-        json_start = result_text.find('{')
-        json_end = result_text.rfind('}') + 1
-        if json_start != -1 and json_end > json_start:
-            result = json.loads(result_text[json_start:json_end])
+        if json_text:
+            result = normalize_to_catalog(orjson.loads(json_text))
+            # pHash ignores blur, so a cached miss would also swallow the user's sharper retake
+            if is_confident_match(result):
+                _cache_store(exact_key, phash, result)
             return result
         
         return {"name": "Unknown", "confidence": 0.0, "description": "Could not parse response"}
@@ -77,6 +344,55 @@ If not a Bakugan or unclear, set confidence below 0.3 and name to "Unknown"."""
         print(f"Analysis error: {e}")
         return {"name": "Error", "confidence": 0.0, "description": str(e)}
 
+def _market_cache_or_fetch(scan_id: str, result: dict) -> dict:
+    """
+    Attach market data to a confident scan without blocking on the scrape
+    Cache hits are returned inline; misses are scraped in the background and polled via /api/market/<scan_id>
+    """
+    if not is_confident_match(result):
+        return {'status': 'skipped'}
+    
+    name = result['name']
+    # The model occasionally returns lists or numbers here; scrape without the filter rather than fail
+    attribute = result.get('attribute')
+    if not isinstance(attribute, str):
+        attribute = None
+    rarity = result.get('rarity')
+    if not isinstance(rarity, str):
+        rarity = None
+    market = get_cached_market_data(name, attribute, rarity)
+    if market is not None:
+        return {'status': 'ready', 'data': market}
+    
+    key = market_cache_key(name, attribute, rarity)
+    submitted = False
+    with _MARKET_JOBS_LOCK:
+        job = _MARKET_INFLIGHT.get(key)
+        if job is None:
+            if sum(1 for running in _MARKET_INFLIGHT.values() if running.queued) >= MARKET_QUEUE_LIMIT:
+                return {'status': 'busy', 'error': 'Market lookups are busy, try again shortly'}
+            job = MarketJob(name, attribute, rarity)
+            _MARKET_INFLIGHT[key] = job
+            submitted = True
+        _MARKET_JOBS[scan_id] = job
+        if len(_MARKET_JOBS) > MARKET_JOBS_LIMIT:
+            _MARKET_JOBS.popitem(last=False)
+    
+    if submitted:
+        # Outside the lock: the callback runs inline if the job has already finished
+        job.future.add_done_callback(lambda _: _forget_inflight(key, job))
+    return {'status': 'pending', 'deadline_seconds': MARKET_JOB_DEADLINE}
+
+
+def _forget_inflight(key, job: MarketJob):
+    with _MARKET_JOBS_LOCK:
+        if _MARKET_INFLIGHT.get(key) is job:
+            del _MARKET_INFLIGHT[key]
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({'error': 'Image too large'}), 413
+
 @app.route('/')
 def index():
     if 'session_id' not in session:
@@ -89,8 +405,7 @@ def history():
         session['session_id'] = str(uuid.uuid4())
     
     session_id = session['session_id']
-    scans = SCANS_STORAGE.get(session_id, [])
-    scans = sorted(scans, key=lambda x: x.get('created_at', ''), reverse=True)[:50]
+    scans = list(SCANS_STORAGE.get(session_id, ()))
     
     return render_template('history.html', scans=scans)
 
@@ -106,14 +421,28 @@ def api_analyze():
         return jsonify({'error': 'No image provided'}), 400
     
     if image_data.startswith('data:'):
-        image_base64 = image_data.split(',')[1]
+        _, _, image_base64 = image_data.partition(',')
+        if not image_base64:
+            return jsonify({'error': 'Malformed data URL'}), 400
     else:
         image_base64 = image_data
     
-    result = analyze_bakugan(image_base64)
+    image_base64 = image_base64.translate(_BASE64_WHITESPACE)
+    
+    try:
+        image_bytes = base64.b64decode(image_base64, validate=True)
+    except ValueError:
+        return jsonify({'error': 'Invalid image data'}), 400
+    
+    try:
+        result = analyze_bakugan(image_bytes)
+    except InvalidImageError as e:
+        print(f"Image decode error: {e}")
+        return jsonify({'error': 'Invalid image'}), 400
     
     scan_id = str(uuid.uuid4())
     session_id = session['session_id']
+    created_at = datetime.now()
     
     scan_record = {
         'id': scan_id,
@@ -125,14 +454,14 @@ def api_analyze():
         'rarity': result.get('rarity'),
         'confidence': result.get('confidence'),
         'description': result.get('description'),
-        'created_at': datetime.now()
+        'created_at': created_at.isoformat(),
+        'created_at_display': created_at.strftime('%b %d, %Y at %I:%M %p')
     }
     
-    if session_id not in SCANS_STORAGE:
-        SCANS_STORAGE[session_id] = []
-    SCANS_STORAGE[session_id].append(scan_record)
+    SCANS_STORAGE[session_id].appendleft(scan_record)
     
     result['id'] = scan_id
+    result['market'] = _market_cache_or_fetch(scan_id, result)
     return jsonify(result)
 
 @app.route('/api/history')
@@ -141,8 +470,7 @@ def api_history():
         return jsonify([])
     
     session_id = session['session_id']
-    scans = SCANS_STORAGE.get(session_id, [])
-    scans = sorted(scans, key=lambda x: x.get('created_at', ''), reverse=True)[:50]
+    scans = list(SCANS_STORAGE.get(session_id, ()))
     
     return jsonify([{
         'id': s['id'],
@@ -153,10 +481,31 @@ def api_history():
         'rarity': s['rarity'],
         'confidence': s['confidence'],
         'description': s['description'],
-        'created_at': s['created_at'].isoformat() if s.get('created_at') else None
+        'created_at': s['created_at']
     } for s in scans])
 
 
+@app.route('/api/market/<scan_id>', methods=['GET'])
+def api_market(scan_id):
+    """Poll the background market data lookup started by /api/analyze"""
+    with _MARKET_JOBS_LOCK:
+        job = _MARKET_JOBS.get(scan_id)
+    
+    if job is None:
+        return jsonify({'status': 'not_found'}), 404
+    
+    if not job.future.done():
+        # The scrape keeps running and still fills the market cache for the next scan
+        if job.timed_out():
+            return jsonify({'status': 'error', 'error': 'Market data lookup timed out'})
+        return jsonify({'status': 'pending', 'queued': job.queued})
+    
+    try:
+        return jsonify({'status': 'ready', 'data': job.future.result()})
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)})
+
+
 @app.route('/api/market-data', methods=['GET'])
 def api_market_data():
     """Get market data (pricing and reference images) for a Bakugan"""
@@ -0,0 +1,11 @@
+"""
+Definitions shared by scraper.py and selenium_backend.py
+Kept separate so the backend never imports scraper, which would load a second
+copy of it when scraper.py is run directly as __main__
+"""
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+
+class BrowserError(Exception):
+    """Raised by the Selenium backend when the browser fails mid-scrape"""
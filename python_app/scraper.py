@@ -1,25 +1,90 @@
 """
 Web scraping module for BakuScan
-Uses Selenium with headless Chrome to scrape pricing and image data
+Fetches server-rendered pages over plain HTTP, using Selenium with headless
+Chrome only as a fallback, to scrape pricing and image data
 Includes fallback mechanisms when web scraping fails
 """
 
 import os
 import re
-import json
+import html
+import functools
 import time
-import shutil
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+import threading
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from scrape_common import USER_AGENT, BrowserError
 
 
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9"
+}
+
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+# Bulk lookups run several scrapes per host at once; keep enough warm sockets for all of them.
+# Read timeouts aren't retried, so a stalled host costs one 10s timeout rather than three.
+# Retry-After is ignored: a rate-limited 503 may ask for hours, and a scrape worker must never sleep that long
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=2, connect=1, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      respect_retry_after_header=False, raise_on_status=False),
+))
+
+SELENIUM_FALLBACK = os.environ.get("SCRAPER_SELENIUM_FALLBACK", "1") != "0"
+
+SCRAPE_WORKERS = 8
+
+MARKET_CACHE_SIZE = 1024
+MARKET_CACHE_TTL = 3600
+MARKET_FALLBACK_TTL = 300
+
+PRICE_CACHE_TTL = 3600
+IMAGE_CACHE_TTL = 24 * 3600
+# Raw page bodies sit below the result cache, so parser changes or a different `limit` can reuse a fetch
+HTTP_CACHE_TTLS = {"ebay.com": 3600, "bing.com": 24 * 3600}
+CACHE_DIR = os.environ.get("BAKUSCAN_CACHE_DIR", os.path.expanduser("~/.cache/bakuscan"))
+# Page bodies are keyed by user-supplied names, so the TTL alone doesn't bound the file
+CACHE_MAX_BYTES = int(os.environ.get("BAKUSCAN_CACHE_MAX_MB", "128")) * 1024 * 1024
+
+_PRICE_RE = re.compile(r'\$?([\d,]+\.?\d*)')
+_EBAY_CARD_CLASS = "s-card"
+_BING_M_RE = re.compile(r'\bm="(\{[^"]*?&quot;murl&quot;[^"]*\})"')
+_BING_RESULT_CLASS = re.compile(r'^(?:iusc|mimg|img_cont)$')
+_BAD_TITLE_SUBSTRS = ("shop on ebay", "sellers with", "returns")
+
+# Run inside the browser on the Selenium path so only the fields we use cross the
+# chromedriver wire, instead of the whole serialized DOM
+_EBAY_CARDS_JS = """
+const text = el => el ? el.textContent.trim() : null;
+return Array.from(document.querySelectorAll('.s-card')).slice(0, arguments[0]).map(card => ({
+    title: text(card.querySelector('[class*="title"]') || card.querySelector('span') || card.querySelector('a')),
+    price: text(card.querySelector('[class*="price"]') || card.querySelector('[class*="Price"]')),
+    url: (card.querySelector('a[href*="ebay.com/itm"]') || {}).href || null
+}));
+"""
+_BING_RESULTS_JS = """
+const limit = arguments[0];
+return {
+    meta: Array.from(document.querySelectorAll('a.iusc')).slice(0, limit * 3)
+        .map(a => a.getAttribute('m')).filter(Boolean),
+    thumbs: Array.from(document.querySelectorAll('img.mimg, .img_cont img')).slice(0, limit)
+        .map(img => img.getAttribute('src') || img.getAttribute('data-src')).filter(Boolean)
+};
+"""
+
 ATTRIBUTE_COLORS = {
     "Pyrus": "#e63946",
     "Aquos": "#0ea5e9",
@@ -38,45 +103,237 @@ RARITY_VALUES = {
 }
 
 
-def get_chromium_binary():
-    """Find Chromium binary path dynamically"""
-    for browser in ['chromium', 'chromium-browser', 'google-chrome', 'chrome']:
-        path = shutil.which(browser)
-        if path:
-            return path
-    return None
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire a fixed number of seconds after being stored"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value, ttl: float = None):
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+_MARKET_CACHE = TTLCache(maxsize=MARKET_CACHE_SIZE, ttl=MARKET_CACHE_TTL)
 
+# Only leaf scrapes run here; nothing submitted to this pool waits on the pool itself
+_SCRAPE_EXECUTOR = ThreadPoolExecutor(max_workers=SCRAPE_WORKERS, thread_name_prefix="scrape")
 
-def create_selenium_driver():
-    """Create a Selenium WebDriver with headless Chrome configured for Replit"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-software-rasterizer")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+
+class DiskCache:
+    """
+    SQLite-backed key/value cache with per-entry expiry that survives restarts
+    Once stored values exceed max_bytes, the entries closest to expiry are evicted first
+    """
     
-    chromium_path = get_chromium_binary()
-    if chromium_path:
-        chrome_options.binary_location = chromium_path
+    def __init__(self, path: str, max_bytes: int = CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+            if columns and "size" not in columns:
+                # Cache files from before the size cap can't be accounted for; it's only a cache
+                self._conn.execute("DROP TABLE cache")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            # Covers the size total and eviction order without reading the large value pages
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry_size ON cache (expires_at, size, key)")
+            self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+    
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+        return orjson.loads(row[0])
     
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
+    def set(self, key: str, value, ttl: float):
+        encoded = orjson.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, size) VALUES (?, ?, ?, ?)",
+                    (key, encoded.decode(), now + ttl, len(encoded))
+                )
+                self._evict_over_cap()
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
     
+    def _evict_over_cap(self):
+        excess = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        
+        doomed = []
+        for doomed_key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY expires_at").fetchall():
+            if excess <= 0:
+                break
+            doomed.append((doomed_key,))
+            excess -= size
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+
+
+@functools.lru_cache(maxsize=1)
+def get_disk_cache() -> Optional[DiskCache]:
+    """Open the shared scrape cache, or None if the cache directory is not writable"""
     try:
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-            "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
-        })
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        return driver
-    except Exception as e:
-        print(f"Error creating Selenium driver: {e}")
+        return DiskCache(os.path.join(CACHE_DIR, "scrape-cache.sqlite3"))
+    except (OSError, sqlite3.Error) as e:
+        print(f"Scrape cache disabled: {e}")
+        return None
+
+
+def _cache_get(key: str):
+    cache = get_disk_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(key)
+    except (sqlite3.Error, ValueError):
+        return None
+
+
+def _cache_set(key: str, value, ttl: float):
+    cache = get_disk_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, value, ttl)
+    except sqlite3.Error as e:
+        print(f"Scrape cache write failed: {e}")
+
+
+def _scrape_cache_key(kind: str, *parts) -> str:
+    return "|".join([kind] + [str(part if part is not None else "").casefold() for part in parts])
+
+
+def _http_cache_ttl(url: str) -> Optional[float]:
+    host = urlsplit(url).hostname or ""
+    for domain, ttl in HTTP_CACHE_TTLS.items():
+        if host == domain or host.endswith("." + domain):
+            return ttl
+    return None
+
+
+def _http_cache_get(url: str) -> Optional[Dict]:
+    """Cached {"body", "complete"} for a URL; complete is False when only a prefix of the page was read"""
+    if _http_cache_ttl(url) is None:
         return None
+    return _cache_get(f"http|{url}")
+
+
+def _http_cache_set(url: str, body: str, complete: bool):
+    ttl = _http_cache_ttl(url)
+    if ttl is not None:
+        _cache_set(f"http|{url}", {"body": body, "complete": complete}, ttl)
+
+
+class _RecordingStream:
+    """Iterator over response chunks that keeps what was read, so a partially read page can still be cached"""
+    
+    def __init__(self, chunks: Iterable):
+        self._chunks = iter(chunks)
+        self.received = []
+        self.exhausted = False
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self.exhausted = True
+            raise
+        self.received.append(chunk)
+        return chunk
+
+
+def fetch_page_http(url: str) -> Optional[str]:
+    """Fetch a server-rendered page directly, returning None on failure"""
+    try:
+        response = _SESSION.get(url, timeout=10, allow_redirects=True)
+        if response.status_code == 200:
+            return response.text
+        print(f"HTTP fetch returned {response.status_code} for {url}")
+    except requests.RequestException as e:
+        print(f"HTTP fetch error for {url}: {e}")
+    return None
+
+
+class SharedDriver:
+    """
+    One pooled Chrome driver shared by related scrapes, checked out only once a scrape falls back to Selenium
+    Scrapes take turns on it, so e.g. both halves of get_market_data navigate the same warm tab
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checkout = None
+        self._driver = None
+    
+    @contextmanager
+    def use(self):
+        """Hold the shared driver for one scrape; yields None if no driver could be created"""
+        with self._lock:
+            if self._checkout is None:
+                import selenium_backend
+                self._checkout = selenium_backend.DRIVER_POOL.acquire()
+                self._driver = self._checkout.__enter__()
+            yield self._driver
+    
+    def close(self):
+        """Return the driver to the pool if one was checked out"""
+        with self._lock:
+            if self._checkout is not None:
+                self._checkout.__exit__(None, None, None)
+                self._checkout = None
+                self._driver = None
+
+
+def extract_with_selenium(url: str, wait_selector: str, script: str, *args, driver: Optional[SharedDriver] = None):
+    """
+    Render a page in headless Chrome and run `script` in it via the Selenium backend, imported only when first needed
+    Uses `driver` if given, otherwise a driver from the pool for just this page
+    """
+    import selenium_backend
+    if driver is None:
+        return selenium_backend.extract_with_selenium(url, wait_selector, script, *args)
+    
+    with driver.use() as shared:
+        if not shared:
+            return None
+        return selenium_backend.extract_with_selenium(url, wait_selector, script, *args, driver=shared)
 
 
 def estimate_price_by_rarity(rarity: str = None) -> Dict:
@@ -98,9 +355,227 @@ def estimate_price_by_rarity(rarity: str = None) -> Dict:
     }
 
 
-def scrape_ebay_prices(bakugan_name: str, attribute: str = None, limit: int = 10, rarity: str = None) -> Dict:
+@functools.lru_cache(maxsize=1)
+def _bs4():
+    """Import bs4 on first parse so the estimate/placeholder paths never load it"""
+    from bs4 import BeautifulSoup, SoupStrainer
+    return BeautifulSoup, SoupStrainer
+
+
+@functools.lru_cache(maxsize=None)
+def _strainer(class_):
+    _, SoupStrainer = _bs4()
+    return SoupStrainer(class_=class_)
+
+
+def _make_soup(page_source: str, only_class):
+    """Parse with lxml, keeping only elements whose class matches `only_class`"""
+    BeautifulSoup, _ = _bs4()
+    return BeautifulSoup(page_source, 'lxml', parse_only=_strainer(only_class))
+
+
+def _element_text(elem) -> str:
+    return "".join(text.strip() for text in elem.xpath(".//text()"))
+
+
+def _first_match(elem, *paths):
+    for path in paths:
+        found = elem.xpath(path)
+        if found:
+            return found[0]
+    return None
+
+
+def _iter_ebay_cards(chunks: Iterable, encoding: Optional[str] = None, complete: bool = True) -> Iterator:
+    """
+    Incrementally parse HTML chunks, yielding each `li.s-card` as soon as it closes
+    Cards are cleared once the consumer moves on, so memory stays O(card)
+    With complete=False the input is a truncated page, and cards only closed by EOF are dropped
+    """
+    from lxml import etree
+    
+    parser = etree.HTMLPullParser(events=("end",), tag="li", encoding=encoding)
+    
+    def cards():
+        for _, elem in parser.read_events():
+            if _EBAY_CARD_CLASS in (elem.get("class") or "").split():
+                yield elem
+                elem.clear()
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from cards()
+    if not complete:
+        return
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        return
+    yield from cards()
+
+
+def _title_matches(title: str, needle: str) -> bool:
+    title_cf = title.casefold()
+    return not any(bad in title_cf for bad in _BAD_TITLE_SUBSTRS) and needle in title_cf
+
+
+def _parse_price(price_text: Optional[str]) -> Optional[float]:
+    """Pull a plausible sale price out of a listing's price text"""
+    price_match = _PRICE_RE.search(price_text or "")
+    if not price_match:
+        return None
+    
+    try:
+        price = float(price_match.group(1).replace(',', ''))
+    except ValueError:
+        return None
+    
+    if price < 1 or price > 500:
+        return None
+    return price
+
+
+def _parse_ebay_listings(chunks: Iterable, bakugan_name: str, limit: int, encoding: Optional[str] = None,
+                         complete: bool = True) -> Tuple[List[Dict], bool]:
     """
-    Scrape eBay sold listings for pricing data using Selenium
+    Extract up to `limit` priced listings whose title mentions the Bakugan, stopping as soon as enough are found
+    Also returns whether the page had any `li.s-card` at all, i.e. whether it was a real results page
+    """
+    listings = []
+    needle = bakugan_name.casefold()
+    saw_cards = False
+    
+    for examined, item in enumerate(_iter_ebay_cards(chunks, encoding, complete)):
+        saw_cards = True
+        if examined >= limit * 3:
+            break
+        
+        try:
+            title_elem = _first_match(item, './/*[contains(@class, "title")]', './/span', './/a')
+            if title_elem is None:
+                continue
+            
+            title = _element_text(title_elem)
+            if not _title_matches(title, needle):
+                continue
+            
+            price_elem = _first_match(item, './/*[contains(@class, "price")]', './/*[contains(@class, "Price")]')
+            if price_elem is None:
+                continue
+            
+            price = _parse_price(_element_text(price_elem))
+            if price is None:
+                continue
+            
+            link_elem = _first_match(item, './/a[contains(@href, "ebay.com/itm")]')
+            listing = {
+                "title": title[:80],
+                "price": price,
+                "url": link_elem.get('href') if link_elem is not None else None
+            }
+            
+            listings.append(listing)
+            
+            if len(listings) >= limit:
+                break
+        
+        except Exception:
+            continue
+    
+    return listings, saw_cards
+
+
+def _listings_from_records(records: List[Dict], bakugan_name: str, limit: int) -> List[Dict]:
+    """Apply the same filters to card records extracted in the browser by _EBAY_CARDS_JS"""
+    listings = []
+    needle = bakugan_name.casefold()
+    
+    for record in records:
+        title = record.get("title") or ""
+        if not _title_matches(title, needle):
+            continue
+        
+        price = _parse_price(record.get("price"))
+        if price is None:
+            continue
+        
+        listings.append({
+            "title": title[:80],
+            "price": price,
+            "url": record.get("url")
+        })
+        
+        if len(listings) >= limit:
+            break
+    
+    return listings
+
+
+def fetch_ebay_listings_http(url: str, bakugan_name: str, limit: int) -> Optional[Tuple[List[Dict], bool]]:
+    """
+    Stream an eBay results page and parse it as it downloads, returning None on failure
+    Returns (listings, saw_cards) as _parse_ebay_listings does
+    The response is closed once `limit` listings are found, so the rest of the page is never read
+    A cached prefix is reused as long as it still holds `limit` listings
+    """
+    cached = _http_cache_get(url)
+    if cached is not None:
+        listings, saw_cards = _parse_ebay_listings([cached["body"]], bakugan_name, limit, complete=cached["complete"])
+        if cached["complete"] or len(listings) >= limit:
+            return listings, saw_cards
+    
+    try:
+        with _SESSION.get(url, timeout=10, allow_redirects=True, stream=True) as response:
+            if response.status_code != 200:
+                print(f"HTTP fetch returned {response.status_code} for {url}")
+                return None
+            encoding = response.encoding or "utf-8"
+            stream = _RecordingStream(response.iter_content(chunk_size=16 * 1024))
+            listings, saw_cards = _parse_ebay_listings(stream, bakugan_name, limit, encoding=encoding)
+            # Never pin a consent page or soft block for the whole TTL
+            if listings:
+                body = b"".join(stream.received).decode(encoding, errors="replace")
+                _http_cache_set(url, body, complete=stream.exhausted)
+            return listings, saw_cards
+    except requests.RequestException as e:
+        print(f"HTTP fetch error for {url}: {e}")
+    return None
+
+
+def _price_summary(listings: List[Dict]) -> Dict:
+    """Average, min, max and count of listing prices in a single pass"""
+    total = 0.0
+    lo = hi = listings[0]["price"]
+    for listing in listings:
+        price = listing["price"]
+        total += price
+        if price < lo:
+            lo = price
+        elif price > hi:
+            hi = price
+    
+    return {
+        "average_price": round(total / len(listings), 2),
+        "min_price": lo,
+        "max_price": hi,
+        "num_listings": len(listings)
+    }
+
+
+def _use_http(backend: str) -> bool:
+    return backend in ("auto", "http")
+
+
+def _use_selenium(backend: str) -> bool:
+    return backend == "selenium" or (backend == "auto" and SELENIUM_FALLBACK)
+
+
+def scrape_ebay_prices(bakugan_name: str, attribute: str = None, limit: int = 10, rarity: str = None,
+                       backend: str = "auto", driver: Optional[SharedDriver] = None) -> Dict:
+    """
+    Scrape eBay sold listings for pricing data
+    backend is "auto" (HTTP, then Selenium if the page had no result cards, e.g. a bot challenge), "http" or "selenium"
+    driver optionally shares one Chrome tab with other scrapes instead of checking one out of the pool
     Falls back to estimated values if scraping fails
     """
     result = {
@@ -121,94 +596,38 @@ def scrape_ebay_prices(bakugan_name: str, attribute: str = None, limit: int = 10
     
     search_url = f"https://www.ebay.com/sch/i.html?_nkw={search_query.replace(' ', '+')}&LH_Sold=1&LH_Complete=1&_sop=13"
     
-    driver = None
+    cache_key = _scrape_cache_key("ebay", bakugan_name, attribute, limit, backend)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        driver = create_selenium_driver()
-        if not driver:
-            fallback = estimate_price_by_rarity(rarity)
-            result.update(fallback)
-            result["bakugan_name"] = bakugan_name
-            result["error"] = "Failed to create browser driver"
-            return result
-        
-        driver.get(search_url)
-        time.sleep(2)
-        
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".s-item, .srp-results"))
-            )
-        except TimeoutException:
-            pass
+        listings = None
+        saw_cards = False
+        if _use_http(backend):
+            fetched = fetch_ebay_listings_http(search_url, bakugan_name, limit)
+            if fetched is not None:
+                listings, saw_cards = fetched
         
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
+        # A results page whose cards just don't match won't look any different in a browser
+        if not listings and not saw_cards and _use_selenium(backend):
+            records = extract_with_selenium(search_url, ".s-item, .srp-results", _EBAY_CARDS_JS, limit * 3, driver=driver)
+            if records is not None:
+                listings = _listings_from_records(records, bakugan_name, limit)
         
-        listings = soup.select('.s-card, .srp-results li.s-card')
-        prices = []
-        
-        for item in listings[:limit * 3]:
-            try:
-                item_classes = item.get('class', [])
-                if 's-card' not in item_classes:
-                    continue
-                
-                title_elem = item.select_one('[class*="title"]') or item.select_one('span') or item.select_one('a')
-                price_elem = item.select_one('[class*="price"]') or item.select_one('[class*="Price"]')
-                link_elem = item.select_one('a[href*="ebay.com/itm"]')
-                
-                if not title_elem or not price_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                
-                if title.lower() == "shop on ebay" or "shop on ebay" in title.lower():
-                    continue
-                
-                if "sellers with" in title.lower() or "returns" in title.lower():
-                    continue
-                
-                if bakugan_name.lower() not in title.lower():
-                    continue
-                
-                price_text = price_elem.get_text(strip=True)
-                price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
-                
-                if not price_match:
-                    continue
-                
-                price = float(price_match.group(1).replace(',', ''))
-                
-                if price < 1 or price > 500:
-                    continue
-                
-                listing = {
-                    "title": title[:80],
-                    "price": price,
-                    "url": link_elem.get('href') if link_elem else None
-                }
-                
-                result["listings"].append(listing)
-                prices.append(price)
-                
-                if len(prices) >= limit:
-                    break
-                    
-            except Exception:
-                continue
-        
-        if prices:
+        if listings:
+            result["listings"] = listings
             result["success"] = True
-            result["average_price"] = round(sum(prices) / len(prices), 2)
-            result["min_price"] = min(prices)
-            result["max_price"] = max(prices)
-            result["num_listings"] = len(prices)
+            result.update(_price_summary(listings))
+            _cache_set(cache_key, result, PRICE_CACHE_TTL)
         else:
             fallback = estimate_price_by_rarity(rarity)
             result.update(fallback)
             result["bakugan_name"] = bakugan_name
+            if listings is None:
+                result["error"] = "Failed to fetch eBay listings"
             
-    except WebDriverException as e:
+    except BrowserError as e:
         fallback = estimate_price_by_rarity(rarity)
         result.update(fallback)
         result["bakugan_name"] = bakugan_name
@@ -218,20 +637,90 @@ def scrape_ebay_prices(bakugan_name: str, attribute: str = None, limit: int = 10
         result.update(fallback)
         result["bakugan_name"] = bakugan_name
         result["error"] = str(e)[:100]
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
     
     return result
 
 
-def scrape_reference_images(bakugan_name: str, attribute: str = None, limit: int = 5) -> Dict:
+def _bing_image_entry(data: Dict, bakugan_name: str) -> Optional[Dict]:
+    img_url = data.get('murl')
+    title = data.get('t', bakugan_name)
+    
+    if img_url and not any(x in img_url.lower() for x in ['gif', 'svg', 'logo']):
+        return {
+            "url": img_url,
+            "title": title[:60] if len(title) > 60 else title,
+            "source": "Web"
+        }
+    return None
+
+
+def _collect_bing_images(meta_attrs: Iterable, thumb_srcs: Iterable, bakugan_name: str, limit: int) -> List[Dict]:
+    """Build image entries from `a.iusc` m attributes, falling back to thumbnail srcs if none are usable"""
+    images = []
+    
+    for m_attr in meta_attrs:
+        if len(images) >= limit:
+            break
+        
+        try:
+            if m_attr:
+                entry = _bing_image_entry(orjson.loads(m_attr), bakugan_name)
+                if entry:
+                    images.append(entry)
+        except Exception:
+            continue
+    
+    if not images:
+        for src in thumb_srcs:
+            if src and src.startswith('http') and 'bing.com/th' not in src.lower():
+                images.append({
+                    "url": src,
+                    "title": bakugan_name,
+                    "source": "Web"
+                })
+    
+    return images
+
+
+def _parse_bing_images(page_source: str, bakugan_name: str, limit: int) -> Tuple[List[Dict], bool]:
+    """
+    Extract up to `limit` full-size image results from a Bing image search page
+    Also returns whether the page had any result metadata (`m=` / `a.iusc`) at all
     """
-    Scrape reference images for a specific Bakugan using Selenium
-    Uses Bing image search as primary source
+    images = []
+    saw_results = False
+    
+    for match in _BING_M_RE.finditer(page_source):
+        saw_results = True
+        if len(images) >= limit:
+            return images, saw_results
+        
+        try:
+            entry = _bing_image_entry(orjson.loads(html.unescape(match.group(1))), bakugan_name)
+            if entry:
+                images.append(entry)
+        except Exception:
+            continue
+    
+    if images:
+        return images, saw_results
+    
+    soup = _make_soup(page_source, _BING_RESULT_CLASS)
+    anchors = list(soup.css.iselect('a.iusc'))
+    images = _collect_bing_images(
+        (item.get('m') for item in anchors),
+        (img.get('src') or img.get('data-src') for img in soup.css.iselect('img.mimg, .img_cont img', limit=limit)),
+        bakugan_name,
+        limit,
+    )
+    return images, saw_results or bool(anchors)
+
+
+def scrape_reference_images(bakugan_name: str, attribute: str = None, limit: int = 5,
+                            backend: str = "auto", driver: Optional[SharedDriver] = None) -> Dict:
+    """
+    Scrape reference images for a specific Bakugan
+    Uses Bing image search as primary source; backend and driver work as in scrape_ebay_prices
     """
     result = {
         "success": False,
@@ -246,63 +735,29 @@ def scrape_reference_images(bakugan_name: str, attribute: str = None, limit: int
     
     bing_url = f"https://www.bing.com/images/search?q={search_query.replace(' ', '+')}&qft=+filterui:photo-photo"
     
-    driver = None
+    cache_key = _scrape_cache_key("bing", bakugan_name, attribute, limit, backend)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        driver = create_selenium_driver()
-        if not driver:
-            result["images"] = get_placeholder_images(bakugan_name, attribute)
-            if result["images"]:
-                result["success"] = True
-            return result
+        saw_results = False
+        if _use_http(backend):
+            cached_page = _http_cache_get(bing_url)
+            page_source = cached_page["body"] if cached_page is not None else fetch_page_http(bing_url)
+            if page_source is not None:
+                result["images"], saw_results = _parse_bing_images(page_source, bakugan_name, limit)
+                if result["images"] and cached_page is None:
+                    _http_cache_set(bing_url, page_source, complete=True)
         
-        driver.get(bing_url)
-        time.sleep(2)
-        
-        try:
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".iusc, .mimg, img"))
-            )
-        except TimeoutException:
-            pass
-        
-        page_source = driver.page_source
-        soup = BeautifulSoup(page_source, 'html.parser')
-        
-        img_links = soup.select('a.iusc')
-        
-        for item in img_links:
-            if len(result["images"]) >= limit:
-                break
-            
-            try:
-                m_attr = item.get('m')
-                if m_attr:
-                    data = json.loads(m_attr)
-                    img_url = data.get('murl')
-                    title = data.get('t', bakugan_name)
-                    
-                    if img_url and not any(x in img_url.lower() for x in ['gif', 'svg', 'logo']):
-                        result["images"].append({
-                            "url": img_url,
-                            "title": title[:60] if len(title) > 60 else title,
-                            "source": "Web"
-                        })
-            except Exception:
-                continue
-        
-        if not result["images"]:
-            img_tags = soup.select('img.mimg, .img_cont img')
-            for img in img_tags[:limit]:
-                src = img.get('src') or img.get('data-src')
-                if src and src.startswith('http') and 'bing.com/th' not in src.lower():
-                    result["images"].append({
-                        "url": src,
-                        "title": bakugan_name,
-                        "source": "Web"
-                    })
+        if not result["images"] and not saw_results and _use_selenium(backend):
+            records = extract_with_selenium(bing_url, ".iusc, .mimg, img", _BING_RESULTS_JS, limit, driver=driver)
+            if records is not None:
+                result["images"] = _collect_bing_images(records["meta"], records["thumbs"], bakugan_name, limit)
         
         if result["images"]:
             result["success"] = True
+            _cache_set(cache_key, result, IMAGE_CACHE_TTL)
         else:
             result["images"] = get_placeholder_images(bakugan_name, attribute)
             if result["images"]:
@@ -316,12 +771,6 @@ def scrape_reference_images(bakugan_name: str, attribute: str = None, limit: int
             result["success"] = True
         else:
             result["error"] = str(e)[:100]
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
     
     return result
 
@@ -340,16 +789,42 @@ def get_placeholder_images(bakugan_name: str, attribute: str = None) -> List[Dic
     } for url in placeholder_urls]
 
 
+def market_cache_key(bakugan_name: str, attribute: str = None, rarity: str = None):
+    """Key identifying one get_market_data lookup; also used by main.py to share in-flight jobs"""
+    return (bakugan_name.casefold(), (attribute or '').casefold(), (rarity or '').casefold())
+
+
+def get_cached_market_data(bakugan_name: str, attribute: str = None, rarity: str = None) -> Optional[Dict]:
+    """Return market data from the cache without scraping, or None if there is no fresh entry"""
+    return _MARKET_CACHE.get(market_cache_key(bakugan_name, attribute, rarity))
+
+
 def get_market_data(bakugan_name: str, attribute: str = None, rarity: str = None) -> Dict:
     """
     Get comprehensive market data including prices and reference images
-    Uses Selenium for web scraping
+    Runs the eBay and image scrapes concurrently since both are network-bound
+    If both fall back to Selenium they share one pooled Chrome tab, one after the other
+    Results are cached per (name, attribute, rarity) since prices move over hours, not seconds
     """
-    pricing = scrape_ebay_prices(bakugan_name, attribute, rarity=rarity)
+    cache_key = market_cache_key(bakugan_name, attribute, rarity)
+    cached = _MARKET_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
     
-    images = scrape_reference_images(bakugan_name, attribute, limit=6)
+    driver = SharedDriver()
+    try:
+        pricing_future = _SCRAPE_EXECUTOR.submit(
+            scrape_ebay_prices, bakugan_name, attribute, rarity=rarity, driver=driver
+        )
+        images_future = _SCRAPE_EXECUTOR.submit(
+            scrape_reference_images, bakugan_name, attribute, limit=6, driver=driver
+        )
+        pricing = pricing_future.result()
+        images = images_future.result()
+    finally:
+        driver.close()
     
-    return {
+    market_data = {
         "bakugan_name": bakugan_name,
         "attribute": attribute,
         "pricing": {
@@ -368,9 +843,28 @@ def get_market_data(bakugan_name: str, attribute: str = None, rarity: str = None
             "error": images["error"]
         }
     }
+    
+    scraped = not pricing.get("estimated") and any(
+        item.get("source") != "Placeholder" for item in images["images"]
+    )
+    _MARKET_CACHE.set(cache_key, market_data, ttl=None if scraped else MARKET_FALLBACK_TTL)
+    return market_data
+
+
+def get_market_data_bulk(items: List[Tuple[str, Optional[str], Optional[str]]], max_workers: int = 8) -> List[Dict]:
+    """
+    Get market data for many (name, attribute, rarity) tuples concurrently
+    Results are returned in the same order as the input
+    """
+    if not items:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="market-bulk") as executor:
+        futures = [executor.submit(get_market_data, name, attribute, rarity) for name, attribute, rarity in items]
+        return [future.result() for future in futures]
 
 
 if __name__ == "__main__":
-    print("Testing Selenium scraping for 'Dragonoid'...")
+    print("Testing scraping for 'Dragonoid'...")
     result = get_market_data("Dragonoid", "Pyrus", "Rare")
-    print(json.dumps(result, indent=2))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
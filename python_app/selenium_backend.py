@@ -0,0 +1,170 @@
+"""
+Selenium backend for the BakuScan scrapers
+Headless Chrome is only needed when a plain HTTP fetch comes back empty, so this
+module is imported lazily by scraper.py and callers that never fall back skip
+the cost of loading Selenium
+"""
+
+import os
+import queue
+import shutil
+import atexit
+import functools
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from scrape_common import USER_AGENT, BrowserError
+
+
+PAGE_LOAD_TIMEOUT = 10
+ELEMENT_WAIT_TIMEOUT = 15
+# Only the DOM is parsed, so subresources are never needed; Bing image URLs come from the `m` attribute
+BLOCKED_RESOURCE_PATTERNS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.css", "*.woff", "*.woff2"]
+DRIVER_POOL_SIZE = int(os.environ.get("SCRAPER_DRIVER_POOL_SIZE", min(4, os.cpu_count() or 1)))
+
+
+@functools.lru_cache(maxsize=1)
+def get_chromium_binary():
+    """Find Chromium binary path dynamically"""
+    for browser in ['chromium', 'chromium-browser', 'google-chrome', 'chrome']:
+        path = shutil.which(browser)
+        if path:
+            return path
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_chrome_options() -> Options:
+    """Build the headless Chrome options once; they never change during the process lifetime"""
+    chrome_options = Options()
+    chrome_options.page_load_strategy = 'eager'
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-software-rasterizer")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    
+    chromium_path = get_chromium_binary()
+    if chromium_path:
+        chrome_options.binary_location = chromium_path
+    
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+        "profile.default_content_setting_values.notifications": 2
+    })
+    return chrome_options
+
+
+def create_selenium_driver():
+    """Create a Selenium WebDriver with headless Chrome configured for Replit"""
+    try:
+        driver = webdriver.Chrome(options=get_chrome_options())
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": BLOCKED_RESOURCE_PATTERNS})
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": USER_AGENT})
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return driver
+    except Exception as e:
+        print(f"Error creating Selenium driver: {e}")
+        return None
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class SeleniumDriverPool:
+    """Bounded LIFO pool of warm headless Chrome drivers, created lazily and reset between uses"""
+    
+    def __init__(self, maxsize: int):
+        self._drivers = queue.LifoQueue(maxsize=maxsize)
+    
+    @contextmanager
+    def acquire(self):
+        """
+        Check a warm driver out of the pool, creating one if the pool is empty
+        Yields None if no driver could be created
+        """
+        try:
+            driver = self._drivers.get_nowait()
+        except queue.Empty:
+            driver = create_selenium_driver()
+        
+        try:
+            yield driver
+        finally:
+            if driver:
+                self._release(driver)
+    
+    def _release(self, driver):
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            self._drivers.put_nowait(driver)
+        except Exception:
+            _quit_driver(driver)
+    
+    def close(self):
+        """Quit every pooled driver"""
+        while True:
+            try:
+                driver = self._drivers.get_nowait()
+            except queue.Empty:
+                return
+            _quit_driver(driver)
+
+
+DRIVER_POOL = SeleniumDriverPool(DRIVER_POOL_SIZE)
+atexit.register(DRIVER_POOL.close)
+
+
+def _run_on_page(driver, url: str, wait_selector: str, script: str, *args):
+    try:
+        driver.get(url)
+    except TimeoutException:
+        pass
+    
+    try:
+        WebDriverWait(driver, ELEMENT_WAIT_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+        )
+    except TimeoutException:
+        pass
+    
+    return driver.execute_script(script, *args)
+
+
+def extract_with_selenium(url: str, wait_selector: str, script: str, *args, driver=None):
+    """
+    Render a page in headless Chrome and return what `script` evaluates to in it
+    Navigates `driver` if given (the caller keeps ownership), otherwise borrows one from the pool
+    Returns None if no driver is available
+    """
+    try:
+        if driver is not None:
+            return _run_on_page(driver, url, wait_selector, script, *args)
+        
+        with DRIVER_POOL.acquire() as pooled:
+            if not pooled:
+                return None
+            return _run_on_page(pooled, url, wait_selector, script, *args)
+    except WebDriverException as e:
+        raise BrowserError(str(e)) from e
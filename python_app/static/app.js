@@ -101,8 +101,8 @@ async function analyzeImage(imageData) {
         if (uploadSection) uploadSection.style.display = 'none';
         if (resultSection) resultSection.style.display = 'block';
         
-        if (result.name && result.name !== 'Unknown' && result.name !== 'Error') {
-            fetchMarketData(result.name, result.attribute, result.rarity);
+        if (result.market && result.market.status !== 'skipped') {
+            fetchMarketData(result.id, result.market);
         }
         
     } catch (err) {
@@ -112,7 +112,11 @@ async function analyzeImage(imageData) {
     }
 }
 
-async function fetchMarketData(bakuganName, attribute, rarity) {
+const MARKET_POLL_INTERVAL_MS = 1000;
+// Used only if the server doesn't send its deadline; it reports 'error' itself once that passes
+const MARKET_DEFAULT_DEADLINE_SECONDS = 90;
+
+async function fetchMarketData(scanId, market) {
     const marketSection = document.getElementById('marketSection');
     const marketLoading = document.getElementById('marketLoading');
     const pricingData = document.getElementById('pricingData');
@@ -126,20 +130,25 @@ async function fetchMarketData(bakuganName, attribute, rarity) {
     if (referenceImages) referenceImages.style.display = 'none';
     
     try {
-        let url = `/api/market-data?name=${encodeURIComponent(bakuganName)}`;
-        if (attribute) {
-            url += `&attribute=${encodeURIComponent(attribute)}`;
-        }
-        if (rarity) {
-            url += `&rarity=${encodeURIComponent(rarity)}`;
+        const deadlineSeconds = market.deadline_seconds || MARKET_DEFAULT_DEADLINE_SECONDS;
+        // A few extra polls so the server's own timeout response arrives before we give up;
+        // polls while the job is still queued don't count, as the server's deadline hasn't started
+        const maxAttempts = Math.ceil(deadlineSeconds * 1000 / MARKET_POLL_INTERVAL_MS) + 5;
+        let attempts = 0;
+        while (market.status === 'pending' && attempts < maxAttempts) {
+            await new Promise(resolve => setTimeout(resolve, MARKET_POLL_INTERVAL_MS));
+            const response = await fetch(`/api/market/${encodeURIComponent(scanId)}`);
+            market = await response.json();
+            if (!market.queued) attempts++;
         }
         
-        const response = await fetch(url);
-        const data = await response.json();
+        if (market.status !== 'ready') {
+            throw new Error(market.error || 'Market data unavailable');
+        }
         
         if (marketLoading) marketLoading.style.display = 'none';
         
-        displayMarketData(data);
+        displayMarketData(market.data);
         
     } catch (err) {
         console.error('Market data error:', err);